@@ -1,5 +1,15 @@
 from django.apps import AppConfig
+from reportlab.pdfbase.ttfonts import TTFError
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .shopping_cart import register_pdf_fonts
+
+        try:
+            register_pdf_fonts()
+        except TTFError:
+            pass
@@ -0,0 +1,64 @@
+from bisect import bisect_left
+from threading import Lock
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from recipes.models import Ingredient
+
+from .serializers import IngredientSerializer
+from .versions import get_table_version
+
+
+class IngredientCatalogue:
+    """Справочник ингредиентов в памяти воркера."""
+
+    def __init__(self, version):
+        self.version = version
+        renderer = JSONRenderer()
+        ingredients = Ingredient.objects.order_by('id')
+        self.rows = [
+            renderer.render(IngredientSerializer(ingredient).data)
+            for ingredient in ingredients
+        ]
+        self.names = sorted(
+            (ingredient.name.lower(), position)
+            for position, ingredient in enumerate(ingredients)
+        )
+        self.keys = [name for name, _ in self.names]
+
+    def search(self, value):
+        """Те же правила, что у IngredientFilterSet.search_name."""
+        if not value:
+            return self.rows
+        value = value.lower()
+        limit = settings.INGREDIENT_SEARCH_LIMIT
+        found = []
+        start = bisect_left(self.keys, value)
+        for name, position in self.names[start:]:
+            if not name.startswith(value) or len(found) >= limit:
+                break
+            found.append(position)
+        for name, position in self.names:
+            if len(found) >= limit:
+                break
+            if value in name and not name.startswith(value):
+                found.append(position)
+        return [self.rows[position] for position in found]
+
+    def search_json(self, value):
+        return b'[' + b','.join(self.search(value)) + b']'
+
+
+_catalogue = {}
+_catalogue_lock = Lock()
+
+
+def get_ingredient_catalogue():
+    version = get_table_version(Ingredient)
+    with _catalogue_lock:
+        catalogue = _catalogue.get('ingredients')
+        if catalogue is None or catalogue.version != version:
+            catalogue = IngredientCatalogue(version)
+            _catalogue['ingredients'] = catalogue
+        return catalogue
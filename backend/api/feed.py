@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from foodgram.pagination import RecipeCursorPagination
+from users.models import Subscription
+
+RECIPE_FEED_KEY = 'recipe_feed_{}'
+RECIPE_FEED_TIMEOUT = 60 * 60
+
+
+def filter_feed(queryset, user):
+    return queryset.filter(Exists(
+        Subscription.objects.filter(
+            subscriber=user, author_id=OuterRef('author_id')
+        )
+    ))
+
+
+def get_feed_head(queryset, user):
+    """Id головы ленты из кэша и один лишний для проверки продолжения."""
+    return cache.get_or_set(
+        RECIPE_FEED_KEY.format(user.id),
+        lambda: list(filter_feed(queryset, user).order_by(
+            '-id'
+        ).values_list('id', flat=True)[:settings.RECIPE_FEED_HEAD_SIZE + 1]),
+        RECIPE_FEED_TIMEOUT,
+    )
+
+
+def invalidate_feeds(*user_ids):
+    cache.delete_many([RECIPE_FEED_KEY.format(user_id)
+                       for user_id in user_ids])
+
+
+def invalidate_author_feeds(*author_ids):
+    invalidate_feeds(*Subscription.objects.filter(
+        author_id__in=author_ids
+    ).values_list('subscriber_id', flat=True))
+
+
+class FeedPagination(RecipeCursorPagination):
+    """Первая страница без фильтров берётся из головы ленты."""
+
+    def paginate_head(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if (not settings.RECIPE_FEED_CACHE
+                or request.query_params.get(self.cursor_query_param)
+                or set(request.query_params) - {
+                    self.cursor_query_param, self.page_size_query_param}
+                or self.page_size > settings.RECIPE_FEED_HEAD_SIZE):
+            return None
+        head = get_feed_head(queryset, request.user)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = None
+        self.page = list(queryset.filter(
+            id__in=head[:self.page_size]
+        ).order_by(*self.ordering))
+        self.has_next = len(head) > self.page_size
+        self.has_previous = False
+        self.next_position = None
+        self.previous_position = None
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = self.paginate_head(queryset, request, view)
+        if page is not None:
+            return page
+        return super().paginate_queryset(
+            filter_feed(queryset, request.user), request, view
+        )
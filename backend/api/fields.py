@@ -0,0 +1,30 @@
+from django.conf import settings
+from drf_extra_fields.fields import HybridImageField
+from rest_framework import serializers
+
+
+class RecipeImageField(HybridImageField):
+    """Картинка base64 или файлом, с проверкой размера и габаритов."""
+
+    def check_size(self, size):
+        if size > settings.RECIPE_IMAGE_MAX_SIZE:
+            raise serializers.ValidationError(
+                'Размер картинки не должен превышать {} МБ.'.format(
+                    settings.RECIPE_IMAGE_MAX_SIZE // (1024 * 1024)
+                )
+            )
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            self.check_size(len(data.split(';base64,')[-1]) * 3 // 4)
+        elif hasattr(data, 'size'):
+            self.check_size(data.size)
+        file = super().to_internal_value(data)
+        width, height = file.image.size
+        if max(width, height) > settings.RECIPE_IMAGE_MAX_DIMENSION:
+            raise serializers.ValidationError(
+                'Картинка не должна быть больше {0}×{0} точек.'.format(
+                    settings.RECIPE_IMAGE_MAX_DIMENSION
+                )
+            )
+        return file
@@ -1,36 +1,113 @@
+from django.db.models import (
+    Case, Count, Exists, ExpressionWrapper, F, FloatField, IntegerField,
+    OuterRef, Subquery, Value, When,
+)
+from django.db.models.functions import Cast
 from django_filters import rest_framework as filters
 
-from recipes.models import Ingredient, Tag, Recipe
+from recipes.models import (
+    Favorite, Ingredient, IngredientAmount, Recipe, ShoppingCart, Tag
+)
+
+
+def count_ingredients(**lookups):
+    return Subquery(
+        IngredientAmount.objects.filter(
+            recipe_id=OuterRef('pk'), **lookups
+        ).order_by().values('recipe_id').annotate(
+            count=Count('pk')
+        ).values('count'),
+        output_field=IntegerField(),
+    )
 
 
 class IngredientFilterSet(filters.FilterSet):
-    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    name = filters.CharFilter(method='search_name')
 
     class Meta:
         model = Ingredient
         fields = ['name']
 
+    def search_name(self, queryset, name, value):
+        return queryset.filter(
+            name__icontains=value
+        ).annotate(
+            match_position=Case(
+                When(name__istartswith=value, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            )
+        ).order_by('match_position', 'name')
+
 
 class RecipeFilterSet(filters.FilterSet):
     tags = filters.ModelMultipleChoiceFilter(
         field_name='tags__slug',
         to_field_name='slug',
         queryset=Tag.objects.all(),
+        method='filter_tags',
     )
     is_favorited = filters.BooleanFilter(method='get_favorites')
     is_in_shopping_cart = filters.BooleanFilter(method='get_in_shopping_cart')
+    ingredients = filters.ModelMultipleChoiceFilter(
+        queryset=Ingredient.objects.all(),
+        method='filter_ingredients',
+    )
+    ordering = filters.ChoiceFilter(
+        choices=(('popular', 'popular'), ('trending', 'trending')),
+        method='order_by_score',
+    )
 
     class Meta:
         model = Recipe
-        fields = ['tags', 'author', 'is_favorited', 'is_in_shopping_cart']
+        fields = ['tags', 'author', 'is_favorited', 'is_in_shopping_cart',
+                  'ingredients', 'ordering']
+
+    def filter_tags(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(Exists(
+            Recipe.tags.through.objects.filter(
+                recipe_id=OuterRef('pk'), tag__in=value
+            )
+        ))
+
+    def filter_user_relation(self, queryset, model, value):
+        if not value:
+            return queryset
+        user = self.request.user
+        if user.is_anonymous:
+            return queryset.none()
+        return queryset.filter(Exists(
+            model.objects.filter(user=user, recipe_id=OuterRef('pk'))
+        ))
 
     def get_favorites(self, queryset, name, value):
-        if value:
-            return Recipe.objects.filter(favorites__user=self.request.user)
-        return Recipe.objects.all()
+        return self.filter_user_relation(queryset, Favorite, value)
 
     def get_in_shopping_cart(self, queryset, name, value):
-        if value:
-            return Recipe.objects.filter(
-                shopping_carts__user=self.request.user)
-        return Recipe.objects.all()
+        return self.filter_user_relation(queryset, ShoppingCart, value)
+
+    def filter_ingredients(self, queryset, name, value):
+        """Рецепты по убыванию доли имеющихся ингредиентов."""
+        if not value:
+            return queryset
+        ids = [ingredient.id for ingredient in value]
+        return queryset.filter(
+            id__in=IngredientAmount.objects.filter(
+                ingredient_id__in=ids
+            ).values('recipe_id')
+        ).annotate(
+            matched_ingredients=count_ingredients(ingredient_id__in=ids),
+            total_ingredients=count_ingredients(),
+            coverage=ExpressionWrapper(
+                Cast('matched_ingredients', FloatField())
+                / F('total_ingredients'),
+                output_field=FloatField(),
+            ),
+        ).order_by('-coverage', '-matched_ingredients', '-id')
+
+    def order_by_score(self, queryset, name, value):
+        return queryset.order_by(
+            F(f'score__{value}').desc(nulls_last=True), '-id'
+        )
@@ -0,0 +1,115 @@
+import random
+import time
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.views import RecipeViewSet
+from recipes.models import Ingredient, IngredientAmount, Recipe
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Замеряет поиск рецептов по ингредиентам (?ingredients=) на '
+            'сгенерированном каталоге. Данные создаются в транзакции, '
+            'которая в конце откатывается.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recipes',
+            default=100000,
+            type=int,
+            help='Сколько рецептов сгенерировать.',
+        )
+        parser.add_argument(
+            '--ingredients',
+            default=2000,
+            type=int,
+            help='Сколько ингредиентов сгенерировать.',
+        )
+        parser.add_argument(
+            '--repeat',
+            default=3,
+            type=int,
+            help='Сколько раз повторять запрос, берётся лучшее время.',
+        )
+        parser.add_argument('--seed', default=1, type=int)
+
+    def generate(self, options):
+        prefix = uuid4().hex[:8]
+        author = User.objects.create_user(
+            email=f'{prefix}@benchmark.local', username=f'benchmark_{prefix}',
+            password=uuid4().hex, first_name='Benchmark',
+            last_name='Benchmark',
+        )
+        Ingredient.objects.bulk_create(
+            [
+                Ingredient(name=f'{prefix} {number}', measurement_unit='г')
+                for number in range(options['ingredients'])
+            ],
+            batch_size=5000,
+        )
+        ingredients = list(Ingredient.objects.filter(
+            name__startswith=f'{prefix} '
+        ).order_by('id').values_list('id', flat=True))
+        Recipe.objects.bulk_create(
+            (
+                Recipe(author=author, name=f'Рецепт {number}', text='-',
+                       cooking_time=1, image='benchmark.png')
+                for number in range(options['recipes'])
+            ),
+            batch_size=5000,
+        )
+        recipes = Recipe.objects.filter(author=author).values_list(
+            'id', flat=True
+        )
+        amounts = IngredientAmount.objects.bulk_create(
+            (
+                IngredientAmount(
+                    recipe_id=recipe_id, ingredient_id=ingredient_id,
+                    amount=1,
+                )
+                for recipe_id in recipes.iterator()
+                for ingredient_id in random.sample(
+                    ingredients, random.randint(3, 12)
+                )
+            ),
+            batch_size=10000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(
+            f'Рецептов: {options["recipes"]}, ингредиентов: '
+            f'{len(ingredients)}, связей: {len(amounts)}'
+        )
+        return author, ingredients
+
+    def measure(self, author, ingredient_ids, repeat):
+        view = RecipeViewSet.as_view({'get': 'list'})
+        request = APIRequestFactory().get(
+            '/api/recipes/', {'limit': 10, 'ingredients': ingredient_ids}
+        )
+        force_authenticate(request, author)
+        response = view(request).render()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            view(request).render()
+            timings.append(time.perf_counter() - started)
+        return response.data['count'], min(timings)
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        author, ingredients = self.generate(options)
+        for size in (3, 10, 50):
+            count, seconds = self.measure(
+                author, ingredients[:size], options['repeat']
+            )
+            self.stdout.write(
+                f'Ингредиентов в запросе: {size}, найдено рецептов: '
+                f'{count}, время: {seconds * 1000:.0f} мс'
+            )
+        transaction.set_rollback(True)
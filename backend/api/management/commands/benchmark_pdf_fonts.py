@@ -0,0 +1,77 @@
+import time
+
+from django.core.management.base import BaseCommand
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from api.shopping_cart import (
+    PDF_FONT, PDF_FONT_FILE, PDFShoppingCartRenderer, register_pdf_fonts
+)
+
+
+def measure(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations
+
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f} мкс'
+    return f'{seconds * 1e3:.1f} мс'
+
+
+class Command(BaseCommand):
+    help = ('Замеряет, сколько стоит регистрация шрифта PDF на один '
+            'запрос списка покупок: раньше TTF разбирался на каждом '
+            'запросе, теперь один раз на процесс.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            default=50,
+            type=int,
+            help='Сколько раз повторять каждый замер.',
+        )
+        parser.add_argument(
+            '--lines',
+            default=20,
+            type=int,
+            help='Сколько строк в списке покупок при замере сборки PDF.',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        ingredients = [
+            {
+                'ingredient__name': f'Ингредиент {number}',
+                'ingredient__measurement_unit': 'г',
+                'total_amount': number,
+            }
+            for number in range(options['lines'])
+        ]
+        renderer = PDFShoppingCartRenderer()
+
+        def register_every_time():
+            pdfmetrics.registerFont(TTFont(PDF_FONT, PDF_FONT_FILE))
+
+        def render_every_time():
+            register_every_time()
+            renderer.render(iter(ingredients))
+
+        register_pdf_fonts()
+        results = (
+            ('Разбор TTF на каждом запросе', measure(
+                register_every_time, iterations
+            )),
+            ('register_pdf_fonts()', measure(
+                register_pdf_fonts, iterations
+            )),
+            ('PDF с разбором TTF', measure(render_every_time, iterations)),
+            ('PDF с зарегистрированным шрифтом', measure(
+                lambda: renderer.render(iter(ingredients)), iterations
+            )),
+        )
+        for title, seconds in results:
+            self.stdout.write(f'{title}: {format_time(seconds)}')
@@ -0,0 +1,26 @@
+# Generated by Django 3.1 on 2026-10-18 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('table', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Таблица')),
+                ('version', models.FloatField(verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'Версия таблицы',
+                'verbose_name_plural': 'Версии таблиц',
+                'ordering': ('table',),
+            },
+        ),
+    ]
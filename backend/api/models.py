@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class TableVersion(models.Model):
+    table = models.CharField(
+        verbose_name='Таблица',
+        max_length=100,
+        primary_key=True,
+    )
+    version = models.FloatField(
+        verbose_name='Версия',
+    )
+
+    class Meta:
+        ordering = ('table',)
+        verbose_name = 'Версия таблицы'
+        verbose_name_plural = 'Версии таблиц'
+
+    def __str__(self):
+        return self.table
@@ -0,0 +1,51 @@
+import json
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import DataAndFiles, JSONParser, MultiPartParser
+
+
+class RequestTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Слишком большой запрос.'
+    default_code = 'request_too_large'
+
+
+class ContentLengthLimitMixin:
+    """Отклоняет запрос по Content-Length, не читая тело."""
+    image_overhead = 1
+
+    def check_content_length(self, parser_context):
+        request = parser_context['request']
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        limit = (settings.RECIPE_IMAGE_MAX_SIZE * self.image_overhead
+                 + settings.DATA_UPLOAD_MAX_MEMORY_SIZE)
+        if length > limit:
+            raise RequestTooLarge()
+
+
+class RecipeJSONParser(ContentLengthLimitMixin, JSONParser):
+    image_overhead = 4 / 3
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        self.check_content_length(parser_context)
+        return super().parse(stream, media_type, parser_context)
+
+
+class RecipeMultiPartParser(ContentLengthLimitMixin, MultiPartParser):
+    """Поля рецепта JSON-строкой в части data, картинка в части image."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        self.check_content_length(parser_context)
+        parsed = super().parse(stream, media_type, parser_context)
+        if 'data' not in parsed.data:
+            return parsed
+        try:
+            data = json.loads(parsed.data['data'])
+        except ValueError:
+            raise ParseError('Поле data должно содержать JSON.')
+        if not isinstance(data, dict):
+            raise ParseError('Поле data должно содержать JSON-объект.')
+        data.update(parsed.files.items())
+        return DataAndFiles(data, {})
@@ -0,0 +1,42 @@
+from django.utils.functional import cached_property
+
+from recipes.models import Favorite, ShoppingCart
+from users.models import Subscription
+
+
+class UserRelations:
+    """Id избранного, корзины и подписок пользователя."""
+
+    def __init__(self, user):
+        self.user = user
+
+    def ids(self, model, user_field, field):
+        if self.user is None or self.user.is_anonymous:
+            return frozenset()
+        return frozenset(model.objects.filter(
+            **{user_field: self.user}
+        ).values_list(field, flat=True))
+
+    @cached_property
+    def favorite_ids(self):
+        return self.ids(Favorite, 'user', 'recipe_id')
+
+    @cached_property
+    def shopping_cart_ids(self):
+        return self.ids(ShoppingCart, 'user', 'recipe_id')
+
+    @cached_property
+    def subscribed_ids(self):
+        return self.ids(Subscription, 'subscriber', 'author_id')
+
+
+def get_user_relations(context):
+    """Связи кэшируются на объекте запроса."""
+    request = context.get('request')
+    if request is None:
+        return UserRelations(None)
+    relations = getattr(request, '_user_relations', None)
+    if relations is None:
+        relations = UserRelations(request.user)
+        request._user_relations = relations
+    return relations
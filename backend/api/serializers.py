@@ -1,6 +1,5 @@
-from django.db.utils import IntegrityError
-from django.shortcuts import get_object_or_404
-from drf_extra_fields.fields import Base64ImageField
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from djoser.serializers import UserSerializer
 from rest_framework import serializers
 
@@ -14,6 +13,9 @@ from recipes.models import (
     ShoppingCart,
 )
 
+from .fields import RecipeImageField
+from .relations import get_user_relations
+
 
 class CustomUserSerializer(UserSerializer):
     is_subscribed = serializers.SerializerMethodField()
@@ -24,19 +26,14 @@ class CustomUserSerializer(UserSerializer):
                   'is_subscribed')
 
     def get_is_subscribed(self, obj):
-        try:
-            user = self.context['request'].user
-            author = obj.username
-            return Subscription.objects.filter(
-                author__username=author,
-                subscriber__username=user.username).exists()
-        except (TypeError, AttributeError, KeyError):
-            return False
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+        return obj.id in get_user_relations(self.context).subscribed_ids
 
 
 class AuthorSerializer(CustomUserSerializer):
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.SerializerMethodField()
+    recipes_count = serializers.ReadOnlyField()
 
     class Meta(CustomUserSerializer.Meta):
         fields = ('id', 'username', 'first_name', 'last_name', 'email',
@@ -45,20 +42,18 @@ class AuthorSerializer(CustomUserSerializer):
     def get_recipes(self, obj):
         author = obj
         request = self.context['request']
-        recipes_limit = request.query_params.get('recipes_limit')
-        recipes = author.recipes.all()
-        try:
-            recipes = recipes[:int(recipes_limit)]
-        except TypeError:
-            recipes = recipes
+        recipes = getattr(author, 'latest_recipes', None)
+        if recipes is None:
+            recipes_limit = request.query_params.get('recipes_limit')
+            recipes = author.recipes.order_by('-id')
+            try:
+                recipes = recipes[:int(recipes_limit)]
+            except (TypeError, ValueError):
+                recipes = recipes
         return RecipeSubscriptionSerializer(
             recipes, many=True, context={'request': request}
         ).data
 
-    def get_recipes_count(self, obj):
-        author = obj
-        return author.recipes.count()
-
 
 class SubscriptionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -112,9 +107,11 @@ class IngredientAmountPostSerializer(serializers.Serializer):
 
 
 class RecipeSubscriptionSerializer(serializers.ModelSerializer):
+    image_card = serializers.ImageField(read_only=True)
+
     class Meta:
         model = Recipe
-        fields = ('id', 'name', 'image', 'cooking_time')
+        fields = ('id', 'name', 'image', 'image_card', 'cooking_time')
 
 
 class RecipeGetSerializer(serializers.ModelSerializer):
@@ -123,34 +120,22 @@ class RecipeGetSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True)
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
+    image_card = serializers.ImageField(read_only=True)
+    image_detail = serializers.ImageField(read_only=True)
 
     class Meta:
         model = Recipe
         fields = '__all__'
 
     def get_ingredients(self, obj):
-        queryset = IngredientAmount.objects.filter(recipe=obj)
+        queryset = obj.ingredients_amount.all()
         return IngredientAmountGetSerializer(queryset, many=True).data
 
     def get_is_favorited(self, obj):
-        try:
-            request = self.context['request']
-            user = request.user
-            recipe = obj
-            return Favorite.objects.filter(user=user, recipe=recipe).exists()
-        except (TypeError, KeyError):
-            return False
+        return obj.id in get_user_relations(self.context).favorite_ids
 
     def get_is_in_shopping_cart(self, obj):
-        try:
-            request = self.context['request']
-            user = request.user
-            recipe = obj
-            return ShoppingCart.objects.filter(
-                user=user, recipe=recipe
-            ).exists()
-        except (TypeError, KeyError):
-            return False
+        return obj.id in get_user_relations(self.context).shopping_cart_ids
 
 
 class RecipePostSerializer(serializers.ModelSerializer):
@@ -158,40 +143,45 @@ class RecipePostSerializer(serializers.ModelSerializer):
     tags = serializers.PrimaryKeyRelatedField(
         many=True, queryset=Tag.objects.all()
     )
-    image = Base64ImageField()
+    image = RecipeImageField()
 
     class Meta:
         model = Recipe
         fields = ('ingredients', 'tags', 'image', 'name', 'text',
                   'cooking_time')
 
-    def validate(self, data):
-        ingredients = self.initial_data.get('ingredients')
-        for ingredient_elements in ingredients:
-            if int(ingredient_elements['amount']) < 1:
+    def validate_ingredients(self, ingredients):
+        ingredient_ids = [element['id'] for element in ingredients]
+        if len(ingredient_ids) != len(set(ingredient_ids)):
+            raise serializers.ValidationError(
+                'В списке есть повторяющиеся ингредиенты.'
+            )
+        for element in ingredients:
+            if element['amount'] < 1:
                 raise serializers.ValidationError(
-                    {'ingredients': (
-                        'Количество должно быть больше 1.'
-                    )
-                    }
+                    'Количество должно быть больше 1.'
                 )
-        return data
+        found = Ingredient.objects.in_bulk(ingredient_ids)
+        missing = [str(pk) for pk in ingredient_ids if pk not in found]
+        if missing:
+            raise serializers.ValidationError(
+                'Ингредиенты не найдены: {}.'.format(', '.join(missing))
+            )
+        for element in ingredients:
+            element['ingredient'] = found[element['id']]
+        return ingredients
 
     def create_ingredient_elements(self, ingredients_data, recipe):
-        ingredients = []
-        for ingredient in ingredients_data:
-            ingredient_id = ingredient['id']
-            amount = ingredient['amount']
-            ingredient = get_object_or_404(Ingredient, id=ingredient_id)
-            ingredients.append(
-                IngredientAmount(
-                    recipe=recipe,
-                    ingredient=ingredient,
-                    amount=amount,
-                )
+        IngredientAmount.objects.bulk_create(
+            IngredientAmount(
+                recipe=recipe,
+                ingredient=element['ingredient'],
+                amount=element['amount'],
             )
-        IngredientAmount.objects.bulk_create(ingredients)
+            for element in ingredients_data
+        )
 
+    @transaction.atomic
     def create(self, validated_data):
         request = self.context['request']
         ingredients_data = validated_data.pop('ingredients')
@@ -200,34 +190,52 @@ class RecipePostSerializer(serializers.ModelSerializer):
             author=request.user, **validated_data
         )
         recipe.tags.set(tags_data)
-
-        try:
-            self.create_ingredient_elements(ingredients_data, recipe)
-        except IntegrityError:
-            recipe.delete()
-            raise serializers.ValidationError(
-                'В списке есть повторяющиеся ингредиенты.'
-            )
+        self.create_ingredient_elements(ingredients_data, recipe)
         return recipe
 
+    def update_ingredient_elements(self, ingredients_data, recipe):
+        """Меняет только изменившиеся строки ингредиентов."""
+        existing = {
+            element.ingredient_id: element
+            for element in recipe.ingredients_amount.all()
+        }
+        requested = {element['id']: element for element in ingredients_data}
+        changed = []
+        for ingredient_id, element in existing.items():
+            if ingredient_id not in requested:
+                continue
+            amount = requested[ingredient_id]['amount']
+            if element.amount != amount:
+                element.amount = amount
+                changed.append(element)
+        removed = existing.keys() - requested.keys()
+        if removed:
+            recipe.ingredients_amount.filter(
+                ingredient_id__in=removed
+            ).delete()
+        IngredientAmount.objects.bulk_update(changed, ['amount'])
+        self.create_ingredient_elements(
+            [
+                element for ingredient_id, element in requested.items()
+                if ingredient_id not in existing
+            ],
+            recipe,
+        )
+
+    @transaction.atomic
     def update(self, instance, validated_data):
-        instance.ingredients_amount.all().delete()
         tags_data = validated_data.pop('tags')
         ingredients_data = validated_data.pop('ingredients')
+        self.update_ingredient_elements(ingredients_data, instance)
         instance = super().update(instance, validated_data)
         instance.tags.set(tags_data)
-
-        try:
-            self.create_ingredient_elements(ingredients_data, instance)
-        except IntegrityError:
-            instance.ingredients_amount.all().delete()
-            raise serializers.ValidationError(
-                'В списке есть повторяющиеся ингредиенты.'
-            )
         return instance
 
     def to_representation(self, instance):
-        return RecipeGetSerializer(instance).data
+        prefetch_related_objects(
+            [instance], 'tags', 'ingredients_amount__ingredient'
+        )
+        return RecipeGetSerializer(instance, context=self.context).data
 
 
 class FavoriteSerializer(serializers.ModelSerializer):
@@ -0,0 +1,306 @@
+import csv
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.functional import LazyObject
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from foodgram.workers import run_in_background
+from recipes.models import Ingredient, IngredientAmount
+from users.models import User
+
+from .versions import get_table_version
+
+PDF_FONT = 'DejaVuSerif'
+PDF_FONT_FILE = 'DejaVuSerif.ttf'
+PDF_SPOOL_MAX_SIZE = 1024 * 1024
+PDF_TOP = 780
+PDF_BOTTOM = 50
+PDF_LINE_HEIGHT = 25
+
+SHOPPING_CART_TITLE = 'Список покупок:'
+SHOPPING_CART_CACHE_KEY = 'shopping_cart_{}_{}'
+SHOPPING_CART_VERSION_KEY = 'shopping_cart_version_{}'
+SHOPPING_CART_CACHE_TIMEOUT = 60 * 60 * 24
+SHOPPING_CART_CACHE_MAX_SIZE = 1024 * 1024
+SHOPPING_CART_JOB_KEY = 'shopping_cart_job_{}'
+SHOPPING_CART_JOB_TIMEOUT = 60 * 60
+JOB_PENDING = 'pending'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+logger = logging.getLogger(__name__)
+
+
+class ShoppingCartJobStorage(LazyObject):
+    """Большие списки покупок, вне публичного MEDIA_ROOT."""
+
+    def _setup(self):
+        self._wrapped = FileSystemStorage(
+            location=settings.SHOPPING_CART_JOB_ROOT
+        )
+
+
+job_storage = ShoppingCartJobStorage()
+
+
+def register_pdf_fonts():
+    """Регистрирует шрифт один раз на процесс."""
+    if PDF_FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(PDF_FONT, PDF_FONT_FILE))
+
+
+def get_shopping_cart_ingredients(user):
+    return IngredientAmount.objects.filter(
+        recipe__shopping_carts__user=user
+    ).values(
+        'ingredient__name',
+        'ingredient__measurement_unit',
+    ).annotate(
+        total_amount=Sum('amount')
+    ).order_by('ingredient__name')
+
+
+def format_ingredient(count, ingredient):
+    return (
+        f'{count}. {ingredient["ingredient__name"]} - '
+        f'{ingredient["total_amount"]} '
+        f'({ingredient["ingredient__measurement_unit"]})'
+    )
+
+
+class ShoppingCartRenderer:
+    """Формат списка: cached возвращает файл, остальные — генератор."""
+    media_type = None
+    extension = None
+    cached = False
+
+    def render(self, ingredients):
+        raise NotImplementedError
+
+
+class PDFShoppingCartRenderer(ShoppingCartRenderer):
+    media_type = 'application/pdf'
+    extension = 'pdf'
+    cached = True
+
+    @staticmethod
+    def start_page(page, title=None):
+        height = PDF_TOP
+        if title is not None:
+            page.setFont(PDF_FONT, size=15)
+            page.drawString(230, height, title)
+            height -= 50
+        page.setFont(PDF_FONT, size=12)
+        return height
+
+    def render(self, ingredients):
+        register_pdf_fonts()
+        file = SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+        page = canvas.Canvas(file, pagesize=A4)
+        height = self.start_page(page, SHOPPING_CART_TITLE)
+
+        for count, ingredient in enumerate(ingredients, 1):
+            if height < PDF_BOTTOM:
+                page.showPage()
+                height = self.start_page(page)
+            page.drawString(50, height, format_ingredient(count, ingredient))
+            height -= PDF_LINE_HEIGHT
+        page.showPage()
+        page.save()
+        file.seek(0)
+        return file
+
+
+class TextShoppingCartRenderer(ShoppingCartRenderer):
+    media_type = 'text/plain; charset=utf-8'
+    extension = 'txt'
+
+    def render(self, ingredients):
+        yield f'{SHOPPING_CART_TITLE}\n\n'
+        for count, ingredient in enumerate(ingredients, 1):
+            yield f'{format_ingredient(count, ingredient)}\n'
+
+
+class EchoBuffer:
+    def write(self, value):
+        return value
+
+
+class CSVShoppingCartRenderer(ShoppingCartRenderer):
+    media_type = 'text/csv; charset=utf-8'
+    extension = 'csv'
+
+    def render(self, ingredients):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(('Ингредиент', 'Количество', 'Единица'))
+        for ingredient in ingredients:
+            yield writer.writerow((
+                ingredient['ingredient__name'],
+                ingredient['total_amount'],
+                ingredient['ingredient__measurement_unit'],
+            ))
+
+
+class JSONShoppingCartRenderer(ShoppingCartRenderer):
+    media_type = 'application/json'
+    extension = 'json'
+
+    def render(self, ingredients):
+        separator = '['
+        for ingredient in ingredients:
+            yield separator + json.dumps({
+                'name': ingredient['ingredient__name'],
+                'measurement_unit': ingredient['ingredient__measurement_unit'],
+                'amount': ingredient['total_amount'],
+            }, ensure_ascii=False)
+            separator = ','
+        yield '[]' if separator == '[' else ']'
+
+
+SHOPPING_CART_RENDERERS = {
+    renderer.extension: renderer()
+    for renderer in (
+        PDFShoppingCartRenderer,
+        TextShoppingCartRenderer,
+        CSVShoppingCartRenderer,
+        JSONShoppingCartRenderer,
+    )
+}
+
+
+def get_shopping_cart_etag(user, renderer):
+    version = cache.get_or_set(
+        SHOPPING_CART_VERSION_KEY.format(user.id),
+        uuid4().hex,
+        SHOPPING_CART_CACHE_TIMEOUT,
+    )
+    recipes = user.shopping_carts.order_by('recipe_id').values_list(
+        'recipe_id', flat=True
+    )
+    digest = hashlib.sha1(
+        f'{version}:{get_table_version(Ingredient)}:'
+        f'{renderer.extension}'.encode()
+    )
+    for recipe_id in recipes.iterator():
+        digest.update(f',{recipe_id}'.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def render_shopping_cart(user, renderer, etag):
+    ingredients = get_shopping_cart_ingredients(user).iterator()
+    if not renderer.cached:
+        return renderer.render(ingredients)
+    key = SHOPPING_CART_CACHE_KEY.format(user.id, renderer.extension)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == etag:
+        return BytesIO(cached[1])
+    file = renderer.render(ingredients)
+    file.seek(0, 2)
+    if file.tell() <= SHOPPING_CART_CACHE_MAX_SIZE:
+        file.seek(0)
+        cache.set(key, (etag, file.read()), SHOPPING_CART_CACHE_TIMEOUT)
+    file.seek(0)
+    return file
+
+
+def save_job_content(job_id, renderer, content):
+    """Большой результат уходит в job_storage, в задаче остаётся имя."""
+    if not renderer.cached:
+        file = SpooledTemporaryFile(max_size=SHOPPING_CART_CACHE_MAX_SIZE)
+        for chunk in content:
+            file.write(chunk.encode())
+        content = file
+    content.seek(0, 2)
+    size = content.tell()
+    content.seek(0)
+    if size <= SHOPPING_CART_CACHE_MAX_SIZE:
+        return {'content': content.read()}
+    name = f'{job_id}.{renderer.extension}'
+    return {'file': job_storage.save(name, File(content, name=name))}
+
+
+def delete_expired_job_files():
+    if not job_storage.exists(''):
+        return
+    expired = timezone.now() - timedelta(seconds=SHOPPING_CART_JOB_TIMEOUT)
+    for name in job_storage.listdir('')[1]:
+        if job_storage.get_modified_time(name) < expired:
+            job_storage.delete(name)
+
+
+def build_shopping_cart_job(job_id, user_id, extension, etag):
+    key = SHOPPING_CART_JOB_KEY.format(job_id)
+    job = cache.get(key)
+    if job is None:
+        return
+    renderer = SHOPPING_CART_RENDERERS[extension]
+    try:
+        user = User.objects.get(pk=user_id)
+        content = render_shopping_cart(user, renderer, etag)
+        job.update(save_job_content(job_id, renderer, content))
+        job['status'] = JOB_DONE
+    except Exception:
+        logger.exception('Не удалось собрать список покупок %s', job_id)
+        job['status'] = JOB_FAILED
+    cache.set(key, job, SHOPPING_CART_JOB_TIMEOUT)
+
+
+def open_shopping_cart_job(job):
+    if 'file' in job:
+        return job_storage.open(job['file'], 'rb')
+    return BytesIO(job['content'])
+
+
+def start_shopping_cart_job(user, renderer):
+    """Возвращает id задачи фоновой сборки списка покупок."""
+    delete_expired_job_files()
+    job_id = uuid4().hex
+    etag = get_shopping_cart_etag(user, renderer)
+    cache.set(
+        SHOPPING_CART_JOB_KEY.format(job_id),
+        {
+            'user': user.id,
+            'extension': renderer.extension,
+            'etag': etag,
+            'status': JOB_PENDING,
+        },
+        SHOPPING_CART_JOB_TIMEOUT,
+    )
+    run_in_background(
+        build_shopping_cart_job, job_id, user.id, renderer.extension, etag
+    )
+    return job_id
+
+
+def get_shopping_cart_job(user, job_id):
+    job = cache.get(SHOPPING_CART_JOB_KEY.format(job_id))
+    if job is None or job['user'] != user.id:
+        return None
+    return job
+
+
+def invalidate_shopping_carts(*user_ids):
+    cache.delete_many(
+        [
+            SHOPPING_CART_CACHE_KEY.format(user_id, extension)
+            for user_id in user_ids
+            for extension, renderer in SHOPPING_CART_RENDERERS.items()
+            if renderer.cached
+        ]
+        + [SHOPPING_CART_VERSION_KEY.format(user_id) for user_id in user_ids]
+    )
@@ -0,0 +1,79 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recipes.counters import change_counter
+from recipes.models import Favorite, Ingredient, Recipe, ShoppingCart, Tag
+from recipes.signals import bulk_saved
+from users.models import Subscription, User
+
+from .feed import invalidate_author_feeds, invalidate_feeds
+from .shopping_cart import invalidate_shopping_carts
+from .versions import bump_table_version
+
+RECIPE_COUNTERS = {
+    Favorite: 'favorites_count',
+    ShoppingCart: 'in_carts_count',
+}
+
+
+@receiver([post_save, post_delete], sender=ShoppingCart)
+def shopping_cart_changed(sender, instance, **kwargs):
+    invalidate_shopping_carts(instance.user_id)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_changed(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_shopping_carts(*ShoppingCart.objects.filter(
+            recipe=instance
+        ).values_list('user_id', flat=True))
+
+
+@receiver([post_save, post_delete, bulk_saved], sender=Ingredient)
+@receiver([post_save, post_delete, bulk_saved], sender=Tag)
+def reference_table_changed(sender, **kwargs):
+    bump_table_version(sender)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_created(sender, instance, created, **kwargs):
+    if created:
+        change_counter(User, instance.author_id, 'recipes_count', 1)
+        invalidate_author_feeds(instance.author_id)
+
+
+@receiver(bulk_saved, sender=Recipe)
+def recipes_bulk_saved(sender, instances, created, **kwargs):
+    if created:
+        authors = Counter(recipe.author_id for recipe in instances)
+        for author_id, count in authors.items():
+            change_counter(User, author_id, 'recipes_count', count)
+        invalidate_author_feeds(*authors)
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted(sender, instance, **kwargs):
+    change_counter(User, instance.author_id, 'recipes_count', -1)
+    invalidate_author_feeds(instance.author_id)
+
+
+@receiver([post_save, post_delete], sender=Subscription)
+def subscription_changed(sender, instance, **kwargs):
+    invalidate_feeds(instance.subscriber_id)
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_save, sender=ShoppingCart)
+def recipe_relation_created(sender, instance, created, **kwargs):
+    if created:
+        change_counter(
+            Recipe, instance.recipe_id, RECIPE_COUNTERS[sender], 1
+        )
+
+
+@receiver(post_delete, sender=Favorite)
+@receiver(post_delete, sender=ShoppingCart)
+def recipe_relation_deleted(sender, instance, **kwargs):
+    change_counter(Recipe, instance.recipe_id, RECIPE_COUNTERS[sender], -1)
@@ -0,0 +1,179 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from recipes.models import (
+    Favorite, Ingredient, IngredientAmount, Recipe, ShoppingCart, Tag
+)
+from users.models import User
+
+from .filters import RecipeFilterSet
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image():
+    buffer = BytesIO()
+    Image.new('RGB', (20, 20), 'red').save(buffer, 'PNG')
+    return ContentFile(buffer.getvalue(), name='image.png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeTestCase(TestCase):
+    recipes_count = 25
+
+    @classmethod
+    def setUpClass(cls):
+        patcher = mock.patch('recipes.images.run_in_background')
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='user@foodgram.ru', username='user', password='password',
+            first_name='Имя', last_name='Фамилия',
+        )
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {number}', color='#ffffff')
+            for number in range(3)
+        ]
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}', measurement_unit='г'
+            )
+            for number in range(5)
+        ]
+        for number in range(cls.recipes_count):
+            recipe = Recipe(
+                author=cls.user, name=f'Рецепт {number}', text='Описание',
+                cooking_time=5,
+            )
+            recipe.image.save('image.png', make_image(), save=False)
+            recipe.save()
+            recipe.tags.set(cls.tags[:2])
+            IngredientAmount.objects.bulk_create([
+                IngredientAmount(
+                    recipe=recipe, ingredient=ingredient, amount=number + 1
+                )
+                for ingredient in cls.ingredients[:3]
+            ])
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class RecipeListQueriesTest(RecipeTestCase):
+    def test_query_count_does_not_depend_on_page_size(self):
+        for limit in (5, 20):
+            with self.subTest(limit=limit), self.assertNumQueries(8):
+                response = self.client.get(
+                    '/api/recipes/', {'limit': limit}
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), limit)
+
+
+class RecipeFilterIndexesTest(RecipeTestCase):
+    recipes_count = 3
+
+    def unique_index(self, model, columns):
+        """SQLite называет индексы ограничений sqlite_autoindex_*."""
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'PRAGMA index_list({table})')
+                constraints = {}
+                for _, name, unique, *_ in cursor.fetchall():
+                    cursor.execute(f'PRAGMA index_info({name})')
+                    constraints[name] = {
+                        'unique': bool(unique),
+                        'columns': [row[2] for row in cursor.fetchall()],
+                    }
+            else:
+                constraints = connection.introspection.get_constraints(
+                    cursor, table
+                )
+        return next(
+            name for name, constraint in constraints.items()
+            if constraint['unique'] and constraint['columns'] == columns
+        )
+
+    def test_filters_use_unique_constraint_indexes(self):
+        recipe = Recipe.objects.first()
+        Favorite.objects.create(user=self.user, recipe=recipe)
+        ShoppingCart.objects.create(user=self.user, recipe=recipe)
+        request = RequestFactory().get('/api/recipes/')
+        request.user = self.user
+        queryset = RecipeFilterSet(
+            {
+                'is_favorited': 'true',
+                'is_in_shopping_cart': 'true',
+                'tags': [self.tags[0].slug],
+            },
+            queryset=Recipe.objects.all(),
+            request=request,
+        ).qs
+        self.assertEqual(list(queryset), [recipe])
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+        plan = queryset.explain()
+        for model, columns in (
+                (Favorite, ['user_id', 'recipe_id']),
+                (ShoppingCart, ['user_id', 'recipe_id']),
+                (Recipe.tags.through, ['recipe_id', 'tag_id'])):
+            with self.subTest(table=model._meta.db_table):
+                self.assertIn(self.unique_index(model, columns), plan)
+
+
+@override_settings(INGREDIENT_CATALOGUE_CACHE=False, INGREDIENT_SEARCH_LIMIT=1)
+class IngredientSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ingredient = Ingredient.objects.create(
+            name='Salt', measurement_unit='г'
+        )
+        Ingredient.objects.create(name='Sea salt', measurement_unit='г')
+
+    def test_list_is_limited(self):
+        response = APIClient().get('/api/ingredients/', {'name': 'salt'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [ingredient['name'] for ingredient in response.data],
+            [self.ingredient.name],
+        )
+
+    def test_retrieve_ignores_limit(self):
+        response = APIClient().get(
+            f'/api/ingredients/{self.ingredient.id}/', {'name': 'Sa'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], self.ingredient.id)
+
+
+class ShoppingCartClearTest(RecipeTestCase):
+    recipes_count = 1
+
+    def test_clear_returns_no_content(self):
+        ShoppingCart.objects.create(
+            user=self.user, recipe=Recipe.objects.first()
+        )
+        response = self.client.delete('/api/recipes/download_shopping_cart/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b'')
+        self.assertFalse(self.user.shopping_carts.exists())
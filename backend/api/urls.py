@@ -7,6 +7,8 @@ from .views import (
     IngredientViewSet,
     RecipeViewSet,
     DownloadPDFShoppingCartAPIView,
+    RecipeExportAPIView,
+    RecipeImportAPIView,
 )
 
 router = DefaultRouter()
@@ -20,6 +22,10 @@ urlpatterns = [
     path('recipes/download_shopping_cart/',
          DownloadPDFShoppingCartAPIView.as_view(),
          name='download_shopping_cart'),
+    path('recipes/import/', RecipeImportAPIView.as_view(),
+         name='import_recipes'),
+    path('recipes/export/', RecipeExportAPIView.as_view(),
+         name='export_recipes'),
     path('', include(router.urls)),
     path('auth/', include('djoser.urls.authtoken')),
 ]
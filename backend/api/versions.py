@@ -0,0 +1,16 @@
+import time
+
+from .models import TableVersion
+
+
+def get_table_version(model):
+    version, _ = TableVersion.objects.get_or_create(
+        table=model._meta.label_lower, defaults={'version': time.time()}
+    )
+    return version.version
+
+
+def bump_table_version(model):
+    TableVersion.objects.update_or_create(
+        table=model._meta.label_lower, defaults={'version': time.time()}
+    )
@@ -1,19 +1,30 @@
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from collections import defaultdict
 
-from io import BytesIO
 
 from djoser.views import UserViewSet
 from rest_framework import status, serializers, permissions, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from django.db.models import BooleanField, Value
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import parse_etags
 
+from foodgram.pagination import RecipePagination
 from users.models import User, Subscription
+from recipes.bulk import RecipeImportError, export_lines, import_recipes
 from recipes.models import (
     Tag,
     Ingredient,
@@ -34,7 +45,50 @@ from .serializers import (
     RecipeSubscriptionSerializer,
 )
 
+from .catalogue import get_ingredient_catalogue
+from .feed import FeedPagination
 from .filters import IngredientFilterSet, RecipeFilterSet
+from .parsers import RecipeJSONParser, RecipeMultiPartParser
+from .versions import get_table_version
+from .shopping_cart import (
+    JOB_FAILED,
+    JOB_PENDING,
+    SHOPPING_CART_RENDERERS,
+    get_shopping_cart_etag,
+    get_shopping_cart_job,
+    open_shopping_cart_job,
+    render_shopping_cart,
+    start_shopping_cart_job,
+)
+
+
+def attach_latest_recipes(authors, limit=None):
+    """Последние рецепты всех авторов страницы одним запросом."""
+    authors = list(authors)
+    author_ids = [author.id for author in authors]
+    if not author_ids:
+        return authors
+    if limit is None:
+        recipes = Recipe.objects.filter(
+            author_id__in=author_ids
+        ).order_by('-id')
+    else:
+        placeholders = ', '.join(['%s'] * len(author_ids))
+        recipes = Recipe.objects.raw(
+            f'SELECT * FROM ('
+            f'SELECT *, ROW_NUMBER() OVER ('
+            f'PARTITION BY author_id ORDER BY id DESC) AS recipe_rank '
+            f'FROM {Recipe._meta.db_table} '
+            f'WHERE author_id IN ({placeholders})'
+            f') AS latest WHERE recipe_rank <= %s ORDER BY id DESC',
+            [*author_ids, limit],
+        )
+    latest_recipes = defaultdict(list)
+    for recipe in recipes:
+        latest_recipes[recipe.author_id].append(recipe)
+    for author in authors:
+        author.latest_recipes = latest_recipes[author.id]
+    return authors
 
 
 class CustomUserViewSet(UserViewSet):
@@ -45,16 +99,26 @@ class CustomUserViewSet(UserViewSet):
             permission_classes=[permissions.IsAuthenticated])
     def subscriptions(self, request):
         subscribes = User.objects.filter(
-            author__in=self.request.user.subscriber.all()
+            author__subscriber=self.request.user
+        ).annotate(
+            is_subscribed=Value(True, output_field=BooleanField())
         )
+        try:
+            recipes_limit = int(request.query_params.get('recipes_limit'))
+        except (TypeError, ValueError):
+            recipes_limit = None
         page = self.paginate_queryset(subscribes)
         if page is not None:
             serializer = AuthorSerializer(
-                page, many=True, context={'request': request}
+                attach_latest_recipes(page, recipes_limit),
+                many=True,
+                context={'request': request},
             )
             return self.get_paginated_response(serializer.data)
         serializer = AuthorSerializer(
-            subscribes, many=True, context={'request': request}
+            attach_latest_recipes(subscribes, recipes_limit),
+            many=True,
+            context={'request': request},
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -88,30 +152,107 @@ class CustomUserViewSet(UserViewSet):
                         status=status.HTTP_400_BAD_REQUEST)
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TableVersionCacheMixin:
+    """Условные GET для справочников по ETag из версии таблицы."""
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        model = self.get_queryset().model
+        version = get_table_version(model)
+        etag = '"{}-{}-{}"'.format(
+            model._meta.model_name,
+            int(version * 1000000),
+            request.accepted_renderer.format,
+        )
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+                status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.REFERENCE_CACHE_MAX_AGE,
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class TagViewSet(TableVersionCacheMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(TableVersionCacheMixin,
+                        viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_class = IngredientFilterSet
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     pagination_class = None
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == 'list' and self.request.query_params.get('name'):
+            return queryset[:settings.INGREDIENT_SEARCH_LIMIT]
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if (settings.INGREDIENT_CATALOGUE_CACHE
+                and request.accepted_renderer.format == 'json'):
+            return self.conditional_response(
+                self.search_catalogue, request, *args, **kwargs
+            )
+        return super().list(request, *args, **kwargs)
+
+    def search_catalogue(self, request, *args, **kwargs):
+        return HttpResponse(
+            get_ingredient_catalogue().search_json(
+                request.query_params.get('name')
+            ),
+            content_type='application/json',
+        )
+
 
 class RecipeViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_class = RecipeFilterSet
+    parser_classes = [RecipeJSONParser, RecipeMultiPartParser]
+    pagination_class = RecipePagination
     queryset = Recipe.objects.all().order_by('-id')
 
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'author'
+        ).prefetch_related(
+            'tags', 'ingredients_amount__ingredient'
+        )
+
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return RecipeGetSerializer
         return RecipePostSerializer
 
+    @action(detail=False, methods=['get'],
+            permission_classes=[permissions.IsAuthenticated])
+    def feed(self, request):
+        paginator = FeedPagination()
+        page = paginator.paginate_queryset(
+            self.filter_queryset(self.get_queryset()), request, self
+        )
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=['get', 'delete'],
             permission_classes=[permissions.IsAuthenticated])
     def favorite(self, request, *args, **kwargs):
@@ -172,57 +313,124 @@ class RecipeViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_400_BAD_REQUEST)
 
 
+class ShoppingCartContentNegotiation(DefaultContentNegotiation):
+    """?format= выбирает формат списка покупок, а не рендерер DRF."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
 class DownloadPDFShoppingCartAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = ShoppingCartContentNegotiation
+
+    def get_renderer(self):
+        extension = self.request.query_params.get('format', 'pdf')
+        if extension not in SHOPPING_CART_RENDERERS:
+            raise serializers.ValidationError({
+                'format': 'Доступные форматы: {}.'.format(
+                    ', '.join(SHOPPING_CART_RENDERERS)
+                )
+            })
+        return SHOPPING_CART_RENDERERS[extension]
+
+    def file_response(self, content, renderer, etag):
+        if etag in parse_etags(
+                self.request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            filename = f'shopping_cart.{renderer.extension}'
+            if renderer.cached:
+                response = FileResponse(
+                    content(),
+                    as_attachment=True,
+                    filename=filename,
+                    content_type=renderer.media_type,
+                )
+            else:
+                response = StreamingHttpResponse(
+                    content(), content_type=renderer.media_type
+                )
+                response['Content-Disposition'] = (
+                    f'attachment; filename="{filename}"'
+                )
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
     def get(self, request):
         user = request.user
-        ingredient_elements = user.shopping_carts.values_list(
-            'recipe__ingredients_amount__ingredient__name',
-            'recipe__ingredients_amount__ingredient__measurement_unit',
-            'recipe__ingredients_amount__amount'
-        )
-        shopping_cart = {}
-
-        for ingredient_element in ingredient_elements:
-            name, measurement_unit, amount = ingredient_element
-            if name not in shopping_cart:
-                shopping_cart[name] = {
-                    'measurement_unit': measurement_unit,
-                    'amount': amount
-                }
-            else:
-                shopping_cart[name]['amount'] += amount
-
-        pdfmetrics.registerFont(
-            TTFont("DejaVuSerif", "DejaVuSerif.ttf", "UTF-8")
-        )
-        response = HttpResponse(content_type='application/pdf')
-        response[
-            'Content-Disposition'] = 'attachment; filename="shopping_cart.pdf"'
-        buffer = BytesIO()
-        page = canvas.Canvas(buffer)
-        page.setFont('DejaVuSerif', size=15)
-        page.drawString(230, 780, f'Список покупок:')
-        page.setFont('DejaVuSerif', size=12)
-        height = 730
-        count = 1
-
-        for name, data in shopping_cart.items():
-            page.drawString(
-                50,
-                height,
-                (
-                    f'{count}. {name} - {data["amount"]} '
-                    f'({data["measurement_unit"]})'
-                ),
+        job_id = request.query_params.get('job')
+        if job_id is not None:
+            return self.get_job(job_id)
+        renderer = self.get_renderer()
+        etag = get_shopping_cart_etag(user, renderer)
+        return self.file_response(
+            lambda: render_shopping_cart(user, renderer, etag),
+            renderer,
+            etag,
+        )
+
+    def get_job(self, job_id):
+        job = get_shopping_cart_job(self.request.user, job_id)
+        if job is None:
+            raise NotFound('Задача не найдена.')
+        if job['status'] == JOB_PENDING:
+            return Response(
+                {'job': job_id, 'status': job['status']},
+                status=status.HTTP_202_ACCEPTED
             )
-            height -= 25
-            count += 1
-        page.showPage()
-        page.save()
-        pdf = buffer.getvalue()
-        buffer.close()
-        response.write(pdf)
-        ShoppingCart.objects.filter(user=user).delete()
+        if job['status'] == JOB_FAILED:
+            return Response(
+                {'job': job_id, 'status': job['status']},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        return self.file_response(
+            lambda: open_shopping_cart_job(job),
+            SHOPPING_CART_RENDERERS[job['extension']],
+            job['etag'],
+        )
+
+    def post(self, request):
+        job_id = start_shopping_cart_job(request.user, self.get_renderer())
+        return Response(
+            {'job': job_id, 'status': JOB_PENDING},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    def delete(self, request):
+        ShoppingCart.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class RecipeImportAPIView(APIView):
+    """Рецепты без автора записываются на текущего пользователя."""
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        file = request.FILES.get('file')
+        if file is None:
+            raise serializers.ValidationError(
+                {'file': 'Загрузите JSONL-файл или ZIP-архив.'}
+            )
+        try:
+            created = import_recipes(file, default_author=request.user)
+        except RecipeImportError as error:
+            raise serializers.ValidationError(
+                {'line': error.line, 'error': error.message}
+            )
+        return Response({'created': created}, status=status.HTTP_201_CREATED)
+
+
+class RecipeExportAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        response = StreamingHttpResponse(
+            export_lines(), content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="recipes.jsonl"'
+        )
         return response
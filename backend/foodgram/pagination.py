@@ -1,5 +1,32 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class CustomLimitPagination(PageNumberPagination):
     page_size_query_param = 'limit'
+
+
+class RecipeCursorPagination(CursorPagination):
+    ordering = '-id'
+    page_size_query_param = 'limit'
+
+
+class RecipePagination(CustomLimitPagination):
+    """С ?cursor= и сортировкой по -id выдача идёт по курсору."""
+    cursor_pagination_class = RecipeCursorPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        ordering = (self.cursor_pagination_class.ordering,)
+        if (cursor_param not in request.query_params
+                or tuple(queryset.query.order_by) != ordering):
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,6 +1,7 @@
 import environ
 
 import os
+import tempfile
 from pathlib import Path
 from django.core.management.utils import get_random_secret_key
 
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
     'imagekit',
     'users',
     'recipes',
+    'api',
 ]
 
 MIDDLEWARE = [
@@ -74,6 +76,47 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', default=''),
+    }
+}
+
+INGREDIENT_SEARCH_LIMIT = 50
+
+INGREDIENT_CATALOGUE_CACHE = True
+
+REFERENCE_CACHE_MAX_AGE = int(
+    os.environ.get('REFERENCE_CACHE_MAX_AGE', default=60)
+)
+
+TAG_SLUG_TRANSLATE = False
+
+TRANSLATION_TIMEOUT = 5
+
+TRANSLATION_CACHE_SIZE = 10000
+
+BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', default=2))
+
+SHOPPING_CART_JOB_ROOT = os.environ.get(
+    'SHOPPING_CART_JOB_ROOT',
+    default=os.path.join(tempfile.gettempdir(), 'foodgram_shopping_carts'),
+)
+
+RECIPE_FEED_CACHE = True
+
+RECIPE_FEED_HEAD_SIZE = 100
+
+RECIPE_SCORE_CART_WEIGHT = 0.5
+
+RECIPE_TRENDING_WINDOW_DAYS = 14
+
+RECIPE_TRENDING_HALF_LIFE_DAYS = 3
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -105,6 +148,14 @@ STATIC_ROOT = BASE_DIR.joinpath('backend_static')
 MEDIA_URL = '/backend_media/'
 MEDIA_ROOT = BASE_DIR.joinpath('backend_media')
 
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
+RECIPE_IMAGE_MAX_SIZE = int(
+    os.environ.get('RECIPE_IMAGE_MAX_SIZE', default=5 * 1024 * 1024)
+)
+
+RECIPE_IMAGE_MAX_DIMENSION = 4096
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
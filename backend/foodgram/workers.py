@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from django.conf import settings
+from django.db import connections
+
+_executors = {}
+_executors_lock = Lock()
+
+
+def get_executor():
+    """Пул потоков создаётся лениво, по одному на процесс."""
+    with _executors_lock:
+        if 'default' not in _executors:
+            _executors['default'] = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_WORKERS,
+                thread_name_prefix='foodgram',
+            )
+        return _executors['default']
+
+
+def run_task(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    return get_executor().submit(run_task, func, *args, **kwargs)
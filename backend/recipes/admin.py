@@ -1,7 +1,4 @@
 from imagekit.admin import AdminThumbnail
-from imagekit import ImageSpec
-from imagekit.processors import ResizeToFill
-from imagekit.cachefiles import ImageCacheFile
 
 from django.contrib import admin
 
@@ -51,27 +48,16 @@ class IngredientAmountInLine(admin.StackedInline):
     extra = 0
 
 
-class AdminThumbnailSpec(ImageSpec):
-    processors = [ResizeToFill(200, 130)]
-    format = 'JPEG'
-    options = {'quality': 100}
-
-
-def cached_admin_thumb(instance):
-    cached = ImageCacheFile(AdminThumbnailSpec(instance.image))
-    cached.generate()
-    return cached
-
-
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
-    image_display = AdminThumbnail(image_field=cached_admin_thumb)
+    image_display = AdminThumbnail(image_field='image_thumbnail')
     image_display.short_description = 'Картинка'
     list_display = (
         'pk',
         'author',
         'name',
         'cooking_time',
+        'favorites_count',
         'image_display'
     )
     list_filter = (
@@ -0,0 +1,285 @@
+import base64
+import json
+import os
+import zipfile
+from itertools import islice
+
+from django.core.files.base import ContentFile, File
+from django.db import connection, transaction
+
+from recipes.images import generate_recipe_images
+from recipes.models import Ingredient, IngredientAmount, Recipe, Tag
+from recipes.signals import bulk_saved
+from users.models import User
+
+EXPORT_FILE_NAME = 'recipes.jsonl'
+
+
+class RecipeImportError(ValueError):
+    def __init__(self, line, message):
+        self.line = line
+        self.message = message
+        super().__init__(f'строка {line}: {message}')
+
+
+def read_batches(records, batch_size):
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def parse_lines(lines):
+    for line, text in enumerate(lines, 1):
+        if isinstance(text, bytes):
+            text = text.decode('utf-8')
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError:
+            raise RecipeImportError(line, 'некорректный JSON')
+        yield line, validate_record(line, record)
+
+
+def is_list_of(value, item_type):
+    return isinstance(value, list) and all(
+        isinstance(item, item_type) for item in value
+    )
+
+
+def validate_record(line, record):
+    if not isinstance(record, dict):
+        raise RecipeImportError(line, 'рецепт должен быть объектом')
+    if not isinstance(record.get('author', ''), str):
+        raise RecipeImportError(line, 'author должен быть строкой')
+    if not is_list_of(record.get('tags', []), str):
+        raise RecipeImportError(line, 'tags должен быть списком строк')
+    if not is_list_of(record.get('ingredients', []), dict):
+        raise RecipeImportError(
+            line, 'ingredients должен быть списком объектов'
+        )
+    return record
+
+
+class RecipeSource:
+    """JSONL-файл с картинками рядом или ZIP-архив."""
+
+    def __init__(self, path_or_file):
+        self.archive = None
+        self.directory = None
+        if zipfile.is_zipfile(path_or_file):
+            self.archive = zipfile.ZipFile(path_or_file)
+        elif isinstance(path_or_file, (str, os.PathLike)):
+            self.directory = os.path.dirname(os.fspath(path_or_file))
+        if hasattr(path_or_file, 'seek'):
+            path_or_file.seek(0)
+        self.path_or_file = path_or_file
+
+    def lines(self):
+        if self.archive is not None:
+            with self.archive.open(EXPORT_FILE_NAME) as file:
+                yield from file
+        elif hasattr(self.path_or_file, 'read'):
+            yield from self.path_or_file
+        else:
+            with open(self.path_or_file, encoding='utf-8') as file:
+                yield from file
+
+    def open_image(self, name):
+        if name.startswith('data:'):
+            header, data = name.split(';base64,', 1)
+            extension = header.split('/')[-1]
+            return ContentFile(
+                base64.b64decode(data), name=f'image.{extension}'
+            )
+        if self.archive is not None:
+            return ContentFile(
+                self.archive.read(name), name=os.path.basename(name)
+            )
+        if self.directory is None:
+            raise KeyError(name)
+        path = os.path.join(self.directory, name)
+        return File(open(path, 'rb'), name=os.path.basename(name))
+
+
+def resolve_batch(batch):
+    emails, slugs, names = set(), set(), set()
+    for _, record in batch:
+        if record.get('author'):
+            emails.add(record['author'])
+        slugs.update(record.get('tags', []))
+        names.update(
+            element['name'] for element in record.get('ingredients', [])
+            if 'name' in element
+        )
+    return (
+        User.objects.in_bulk(emails, field_name='email'),
+        Tag.objects.in_bulk(slugs, field_name='slug'),
+        Ingredient.objects.in_bulk(names, field_name='name'),
+    )
+
+
+def positive_int(line, value, field):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = 0
+    if value < 1:
+        raise RecipeImportError(line, f'{field} должно быть не меньше 1')
+    return value
+
+
+def build_recipe(line, record, authors, tags, ingredients, default_author):
+    for field in ('name', 'text', 'cooking_time', 'image'):
+        if not record.get(field):
+            raise RecipeImportError(line, f'не заполнено поле {field}')
+    if record.get('author'):
+        author = authors.get(record['author'])
+        if author is None:
+            raise RecipeImportError(
+                line, f'автор {record["author"]} не найден'
+            )
+    elif default_author is not None:
+        author = default_author
+    else:
+        raise RecipeImportError(line, 'не заполнено поле author')
+    missing_tags = [slug for slug in record.get('tags', [])
+                    if slug not in tags]
+    if missing_tags:
+        raise RecipeImportError(
+            line, 'теги не найдены: {}'.format(', '.join(missing_tags))
+        )
+    amounts = {}
+    for element in record.get('ingredients', []):
+        ingredient = ingredients.get(element.get('name'))
+        if ingredient is None:
+            raise RecipeImportError(
+                line, f'ингредиент {element.get("name")} не найден'
+            )
+        if ingredient.id in amounts:
+            raise RecipeImportError(
+                line, f'ингредиент {ingredient.name} повторяется'
+            )
+        amounts[ingredient.id] = positive_int(
+            line, element.get('amount'), f'количество {ingredient.name}'
+        )
+    recipe = Recipe(
+        author=author,
+        name=record['name'],
+        text=record['text'],
+        cooking_time=positive_int(
+            line, record['cooking_time'], 'время приготовления'
+        ),
+    )
+    tag_ids = [tags[slug].id for slug in record.get('tags', [])]
+    return recipe, tag_ids, amounts
+
+
+def save_image(line, recipe, name, source):
+    try:
+        image = source.open_image(name)
+    except (KeyError, OSError, ValueError):
+        raise RecipeImportError(line, f'картинка {name} не найдена')
+    with image:
+        recipe.image.save(image.name, image, save=False)
+
+
+@transaction.atomic
+def import_batch(batch, source, default_author=None):
+    authors, tags, ingredients = resolve_batch(batch)
+    built = [
+        build_recipe(line, record, authors, tags, ingredients,
+                     default_author)
+        for line, record in batch
+    ]
+    for (line, record), (recipe, _, _) in zip(batch, built):
+        save_image(line, recipe, record['image'], source)
+    recipes = [recipe for recipe, _, _ in built]
+    if connection.features.can_return_rows_from_bulk_insert:
+        Recipe.objects.bulk_create(recipes)
+        bulk_saved.send(sender=Recipe, instances=recipes, created=True)
+        transaction.on_commit(lambda: generate_recipe_images(recipes))
+    else:
+        for recipe in recipes:
+            recipe.save()
+    Recipe.tags.through.objects.bulk_create(
+        Recipe.tags.through(recipe_id=recipe.id, tag_id=tag_id)
+        for recipe, tag_ids, _ in built
+        for tag_id in tag_ids
+    )
+    IngredientAmount.objects.bulk_create(
+        IngredientAmount(
+            recipe_id=recipe.id, ingredient_id=ingredient_id, amount=amount
+        )
+        for recipe, _, amounts in built
+        for ingredient_id, amount in amounts.items()
+    )
+    return recipes
+
+
+def import_recipes(path_or_file, batch_size=500, default_author=None):
+    """Возвращает число созданных рецептов."""
+    source = RecipeSource(path_or_file)
+    created = 0
+    for batch in read_batches(parse_lines(source.lines()), batch_size):
+        created += len(import_batch(batch, source, default_author))
+    return created
+
+
+def serialize_recipe(recipe):
+    return {
+        'author': recipe.author.email,
+        'name': recipe.name,
+        'text': recipe.text,
+        'cooking_time': recipe.cooking_time,
+        'image': recipe.image.name,
+        'tags': [tag.slug for tag in recipe.tags.all()],
+        'ingredients': [
+            {
+                'name': element.ingredient.name,
+                'measurement_unit': element.ingredient.measurement_unit,
+                'amount': element.amount,
+            }
+            for element in recipe.ingredients_amount.all()
+        ],
+    }
+
+
+def iterate_recipes(queryset=None, batch_size=500):
+    """Пачками по id: iterator() в Django 3.1 не делает prefetch."""
+    if queryset is None:
+        queryset = Recipe.objects.all()
+    queryset = queryset.select_related('author').prefetch_related(
+        'tags', 'ingredients_amount__ingredient'
+    ).order_by('id')
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        yield from batch
+        last_id = batch[-1].id
+
+
+def export_lines(queryset=None, batch_size=500):
+    for recipe in iterate_recipes(queryset, batch_size):
+        yield json.dumps(serialize_recipe(recipe), ensure_ascii=False) + '\n'
+
+
+def export_archive(file, queryset=None, batch_size=500):
+    with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(EXPORT_FILE_NAME, 'w') as lines:
+            images = []
+            for recipe in iterate_recipes(queryset, batch_size):
+                lines.write((json.dumps(
+                    serialize_recipe(recipe), ensure_ascii=False
+                ) + '\n').encode())
+                images.append(recipe.image.name)
+        for name in images:
+            with Recipe.image.field.storage.open(name) as image:
+                with archive.open(name, 'w') as member:
+                    for chunk in image.chunks():
+                        member.write(chunk)
@@ -0,0 +1,29 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def change_counter(model, pk, field, delta):
+    model.objects.filter(pk=pk).update(**{field: F(field) + delta})
+
+
+def count_subquery(model, field):
+    return Coalesce(Subquery(
+        model.objects.filter(
+            **{field: OuterRef('pk')}
+        ).order_by().values(field).annotate(
+            count=Count('pk')
+        ).values('count')
+    ), 0)
+
+
+def rebuild_recipe_counters(recipe_model, favorite_model, cart_model):
+    recipe_model.objects.update(
+        favorites_count=count_subquery(favorite_model, 'recipe'),
+        in_carts_count=count_subquery(cart_model, 'recipe'),
+    )
+
+
+def rebuild_user_counters(user_model, recipe_model):
+    user_model.objects.update(
+        recipes_count=count_subquery(recipe_model, 'author'),
+    )
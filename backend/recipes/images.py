@@ -0,0 +1,36 @@
+from threading import Lock
+
+from imagekit.processors import ResizeToFill, ResizeToFit
+
+from foodgram.workers import run_in_background
+
+RECIPE_IMAGE_SIZES = {
+    'image_card': ResizeToFill(480, 320),
+    'image_detail': ResizeToFit(1200, 1200),
+    'image_thumbnail': ResizeToFill(200, 130),
+}
+
+_generate_lock = Lock()
+
+
+def generate_image(file):
+    """pilkit не потокобезопасен, поэтому картинки строятся по одной."""
+    with _generate_lock:
+        file.generate()
+
+
+class BackgroundStrategy:
+    """Строит размеры картинки в фоне после сохранения оригинала."""
+
+    def on_source_saved(self, file):
+        run_in_background(generate_image, file)
+
+    def should_verify_existence(self, file):
+        return False
+
+
+def generate_recipe_images(recipes):
+    """Для рецептов, созданных bulk_create."""
+    for recipe in recipes:
+        for name in RECIPE_IMAGE_SIZES:
+            run_in_background(generate_image, getattr(recipe, name))
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from recipes.bulk import export_archive, export_lines
+
+
+class Command(BaseCommand):
+    help = ('Выгружает все рецепты в JSONL-файл или, если путь '
+            'оканчивается на .zip, в архив вместе с картинками.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path, help='Путь к JSONL или ZIP.')
+        parser.add_argument(
+            '--batch-size',
+            default=500,
+            type=int,
+            help='Сколько рецептов читать за один запрос.',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if path.suffix == '.zip':
+            export_archive(path, batch_size=options['batch_size'])
+        else:
+            with path.open('w', encoding='utf-8') as file:
+                file.writelines(
+                    export_lines(batch_size=options['batch_size'])
+                )
+        self.stdout.write(self.style.SUCCESS(f'Рецепты выгружены в {path}'))
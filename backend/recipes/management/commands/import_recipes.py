@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.bulk import RecipeImportError, import_recipes
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Импортирует рецепты из JSONL-файла или ZIP-архива '
+            '(recipes.jsonl и картинки).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path, help='Путь к JSONL или ZIP.')
+        parser.add_argument(
+            '--batch-size',
+            default=500,
+            type=int,
+            help='Сколько рецептов записывать за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--author',
+            help='Email автора для рецептов, у которых он не указан.',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'файл {path} не найден')
+        author = None
+        if options['author']:
+            author = User.objects.filter(email=options['author']).first()
+            if author is None:
+                raise CommandError(f'автор {options["author"]} не найден')
+        try:
+            created = import_recipes(path, options['batch_size'], author)
+        except RecipeImportError as error:
+            raise CommandError(str(error))
+        self.stdout.write(self.style.SUCCESS(f'Добавлено рецептов: {created}'))
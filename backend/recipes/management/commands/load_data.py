@@ -1,22 +1,86 @@
 import csv
-from django.core.management.base import BaseCommand, CommandError
-from django.db.utils import IntegrityError
+from itertools import islice
 from pathlib import Path
 
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
 from recipes.models import Ingredient
+from recipes.signals import bulk_saved
 
 
 class Command(BaseCommand):
+    help = 'Загружает ингредиенты из CSV-файла (название, единица).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=Path.cwd().joinpath('fixtures/ingredients.csv'),
+            type=Path,
+            help='Путь к CSV-файлу с ингредиентами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            default=1000,
+            type=int,
+            help='Сколько строк обрабатывать за один запрос.',
+        )
+
+    def read_batches(self, file, batch_size):
+        rows = enumerate(csv.reader(file), 1)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def load_batch(self, batch):
+        """Возвращает (добавлено, обновлено, пропущено) для пачки строк."""
+        units = {}
+        for line, row in batch:
+            if len(row) != 2:
+                raise CommandError(f'строка {line}: ожидалось 2 поля, {row}')
+            name, unit = row
+            units.setdefault(name, unit)
+        skipped = len(batch) - len(units)
+
+        existing = Ingredient.objects.in_bulk(units, field_name='name')
+        new = [
+            Ingredient(name=name, measurement_unit=unit)
+            for name, unit in units.items()
+            if name not in existing
+        ]
+        changed = []
+        for name, ingredient in existing.items():
+            if ingredient.measurement_unit == units[name]:
+                skipped += 1
+            else:
+                ingredient.measurement_unit = units[name]
+                changed.append(ingredient)
+        Ingredient.objects.bulk_create(new, ignore_conflicts=True)
+        Ingredient.objects.bulk_update(changed, ['measurement_unit'])
+        if new:
+            bulk_saved.send(sender=Ingredient, instances=new, created=True)
+        if changed:
+            bulk_saved.send(
+                sender=Ingredient, instances=changed, created=False
+            )
+        return len(new), len(changed), skipped
 
     def handle(self, *args, **options):
-        data = Path.cwd().joinpath('fixtures/ingredients.csv')
-        with data.open(encoding='utf-8') as file:
-            file_reader = csv.reader(file)
-            for row in file_reader:
-                name, unit = row
-                try:
-                    Ingredient.objects.get_or_create(name=name,
-                                                     measurement_unit=unit)
-                except IntegrityError:
-                    raise CommandError(
-                        f'повторяющийся ингредиент в списке {name}, {unit}')
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'файл {path} не найден')
+        inserted = updated = skipped = 0
+        with path.open(encoding='utf-8') as file, transaction.atomic():
+            for batch in self.read_batches(file, options['batch_size']):
+                batch_inserted, batch_updated, batch_skipped = (
+                    self.load_batch(batch)
+                )
+                inserted += batch_inserted
+                updated += batch_updated
+                skipped += batch_skipped
+        self.stdout.write(self.style.SUCCESS(
+            f'Добавлено: {inserted}, обновлено: {updated}, '
+            f'пропущено: {skipped}'
+        ))
@@ -0,0 +1,60 @@
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from recipes.models import Tag
+from recipes.signals import bulk_saved
+from recipes.translation import make_slugs
+
+
+class Command(BaseCommand):
+    help = 'Загружает теги из CSV-файла (название, цвет в HEX).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=Path.cwd().joinpath('fixtures/tags.csv'),
+            type=Path,
+            help='Путь к CSV-файлу с тегами.',
+        )
+
+    def read_tags(self, file):
+        colors = {}
+        for line, row in enumerate(csv.reader(file), 1):
+            if len(row) != 2:
+                raise CommandError(f'строка {line}: ожидалось 2 поля, {row}')
+            name, color = row
+            colors.setdefault(name, color)
+        return colors
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'файл {path} не найден')
+        with path.open(encoding='utf-8') as file:
+            colors = self.read_tags(file)
+        existing = set(Tag.objects.filter(name__in=colors).values_list(
+            'name', flat=True
+        ))
+        names = [name for name in colors if name not in existing]
+        slugs = make_slugs(names)
+        taken = set(Tag.objects.filter(
+            slug__in=slugs.values()
+        ).values_list('slug', flat=True))
+        for name in names:
+            if slugs[name] in taken:
+                raise CommandError(f'слаг {slugs[name]} тега {name} занят')
+            taken.add(slugs[name])
+        tags = [
+            Tag(name=name, color=colors[name], slug=slugs[name])
+            for name in names
+        ]
+        with transaction.atomic():
+            Tag.objects.bulk_create(tags)
+            if tags:
+                bulk_saved.send(sender=Tag, instances=tags, created=True)
+        self.stdout.write(self.style.SUCCESS(
+            f'Добавлено: {len(names)}, пропущено: {len(colors) - len(names)}'
+        ))
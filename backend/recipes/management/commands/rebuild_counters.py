@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.counters import rebuild_recipe_counters, rebuild_user_counters
+from recipes.models import Favorite, Recipe, ShoppingCart
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает счётчики избранного и списков покупок у '
+            'рецептов и число рецептов у авторов.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_recipe_counters(Recipe, Favorite, ShoppingCart)
+            rebuild_user_counters(User, Recipe)
+        self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны'))
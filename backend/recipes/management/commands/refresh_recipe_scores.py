@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from recipes.scores import refresh_recipe_scores
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рейтинги рецептов для сортировок popular и '
+            'trending. Запускается периодически, например из cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=1000,
+            type=int,
+            help='Сколько рейтингов записывать за один запрос.',
+        )
+
+    def handle(self, *args, **options):
+        trending = refresh_recipe_scores(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинги пересчитаны, активных рецептов: {trending}'
+        ))
@@ -0,0 +1,43 @@
+# Generated by Django 3.1 on 2026-10-18 05:50
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_ingredient_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Translation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=200, verbose_name='Исходная строка')),
+                ('dest', models.CharField(max_length=10, verbose_name='Язык перевода')),
+                ('text', models.CharField(max_length=255, verbose_name='Перевод')),
+                ('last_used', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Последнее обращение')),
+            ],
+            options={
+                'verbose_name': 'Перевод',
+                'verbose_name_plural': 'Переводы',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.AlterField(
+            model_name='ingredientamount',
+            name='amount',
+            field=models.SmallIntegerField(validators=[django.core.validators.MinValueValidator(1, 'Количество не может быть меньше 1')], verbose_name='Количество'),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='cooking_time',
+            field=models.SmallIntegerField(validators=[django.core.validators.MinValueValidator(1, 'Время приготовления не может быть меньше 1 минуты')], verbose_name='Время приготовления в минутах'),
+        ),
+        migrations.AddConstraint(
+            model_name='translation',
+            constraint=models.UniqueConstraint(fields=('source', 'dest'), name='unique_translation'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.1 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+from recipes.counters import rebuild_recipe_counters
+
+
+def fill_counters(apps, schema_editor):
+    rebuild_recipe_counters(
+        apps.get_model('recipes', 'Recipe'),
+        apps.get_model('recipes', 'Favorite'),
+        apps.get_model('recipes', 'ShoppingCart'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0006_auto_20261018_0550'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В избранном'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='in_carts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='В списках покупок'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1 on 2026-10-18 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_auto_20261018_0601'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingredientamount',
+            index=models.Index(fields=['ingredient', 'recipe'], name='ingredient_recipe_idx'),
+        ),
+    ]
@@ -1,12 +1,13 @@
 from colorfield.fields import ColorField
+from imagekit.models import ImageSpecField
 
 from django.db import models
 from django.db.models import UniqueConstraint
-from django.utils.text import slugify
 from django.core.validators import MinValueValidator, validate_unicode_slug
 
 from users.models import User
-from recipes.translation import get_translate_ru_to_en, get_alternative
+from recipes.images import RECIPE_IMAGE_SIZES, BackgroundStrategy
+from recipes.translation import make_slug
 
 
 class Tag(models.Model):
@@ -38,10 +39,7 @@ class Tag(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        if self.slug is not None:
-            self.slug = slugify(get_alternative(self.name))
-        else:
-            self.slug = slugify(get_translate_ru_to_en(self.name))
+        self.slug = make_slug(self.name)
         super().save(*args, **kwargs)
 
 
@@ -61,6 +59,27 @@ class Recipe(models.Model):
         verbose_name='Картинка',
         upload_to='recipes/'
     )
+    image_card = ImageSpecField(
+        source='image',
+        processors=[RECIPE_IMAGE_SIZES['image_card']],
+        format='JPEG',
+        options={'quality': 85},
+        cachefile_strategy=BackgroundStrategy,
+    )
+    image_detail = ImageSpecField(
+        source='image',
+        processors=[RECIPE_IMAGE_SIZES['image_detail']],
+        format='JPEG',
+        options={'quality': 85},
+        cachefile_strategy=BackgroundStrategy,
+    )
+    image_thumbnail = ImageSpecField(
+        source='image',
+        processors=[RECIPE_IMAGE_SIZES['image_thumbnail']],
+        format='JPEG',
+        options={'quality': 100},
+        cachefile_strategy=BackgroundStrategy,
+    )
     text = models.TextField(
         verbose_name='Описание',
     )
@@ -79,8 +98,22 @@ class Recipe(models.Model):
         validators=[MinValueValidator(1, 'Время приготовления не может '
                                          'быть меньше 1 минуты')]
     )
+    favorites_count = models.PositiveIntegerField(
+        verbose_name='В избранном',
+        default=0,
+        editable=False,
+    )
+    in_carts_count = models.PositiveIntegerField(
+        verbose_name='В списках покупок',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
+        indexes = [
+            models.Index(fields=['author', '-id'],
+                         name='recipe_author_id_idx'),
+        ]
         ordering = ('id',)
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
@@ -156,6 +189,10 @@ class IngredientAmount(models.Model):
             UniqueConstraint(fields=['recipe', 'ingredient'],
                              name='unique_recipe_ingredient')
         ]
+        indexes = [
+            models.Index(fields=['ingredient', 'recipe'],
+                         name='ingredient_recipe_idx'),
+        ]
         ordering = ('id',)
         verbose_name = 'Элемент рецепта'
         verbose_name_plural = 'Элементы рецепта'
@@ -174,6 +211,11 @@ class Favorite(models.Model):
         on_delete=models.CASCADE,
         related_name='favorites'
     )
+    created = models.DateTimeField(
+        verbose_name='Добавлено',
+        auto_now_add=True,
+        db_index=True,
+    )
 
     class Meta:
         constraints = [
@@ -203,6 +245,11 @@ class ShoppingCart(models.Model):
         on_delete=models.CASCADE,
         related_name='shopping_carts'
     )
+    created = models.DateTimeField(
+        verbose_name='Добавлено',
+        auto_now_add=True,
+        db_index=True,
+    )
 
     class Meta:
         constraints = [
@@ -217,3 +264,61 @@ class ShoppingCart(models.Model):
         return 'Пользователь {} добавил рецепт {} в список покупок'.format(
             self.user.username, self.recipe.name
         )
+
+
+class Translation(models.Model):
+    source = models.CharField(
+        verbose_name='Исходная строка',
+        max_length=200
+    )
+    dest = models.CharField(
+        verbose_name='Язык перевода',
+        max_length=10
+    )
+    text = models.CharField(
+        verbose_name='Перевод',
+        max_length=255
+    )
+    last_used = models.DateTimeField(
+        verbose_name='Последнее обращение',
+        auto_now=True,
+        db_index=True
+    )
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=['source', 'dest'],
+                             name='unique_translation')
+        ]
+        ordering = ('id',)
+        verbose_name = 'Перевод'
+        verbose_name_plural = 'Переводы'
+
+    def __str__(self):
+        return '{} -> {}'.format(self.source, self.text)
+
+
+class RecipeScore(models.Model):
+    recipe = models.OneToOneField(
+        Recipe,
+        verbose_name='Рецепт',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score'
+    )
+    popular = models.FloatField(
+        verbose_name='Популярность',
+        db_index=True,
+    )
+    trending = models.FloatField(
+        verbose_name='Популярность за последнее время',
+        db_index=True,
+    )
+
+    class Meta:
+        ordering = ('recipe',)
+        verbose_name = 'Рейтинг рецепта'
+        verbose_name_plural = 'Рейтинги рецептов'
+
+    def __str__(self):
+        return 'Рейтинг рецепта {}'.format(self.recipe_id)
@@ -0,0 +1,54 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from recipes.models import Favorite, Recipe, RecipeScore, ShoppingCart
+
+
+def add_trending_activity(scores, model, weight, today):
+    """Вклад дня затухает вдвое каждые RECIPE_TRENDING_HALF_LIFE_DAYS."""
+    since = today - timedelta(days=settings.RECIPE_TRENDING_WINDOW_DAYS)
+    activity = model.objects.filter(
+        created__date__gt=since
+    ).annotate(
+        day=TruncDate('created')
+    ).values('recipe_id', 'day').annotate(
+        count=Count('id')
+    ).order_by()
+    for row in activity.iterator():
+        age = (today - row['day']).days
+        decay = 0.5 ** (age / settings.RECIPE_TRENDING_HALF_LIFE_DAYS)
+        scores[row['recipe_id']] += weight * row['count'] * decay
+
+
+def refresh_recipe_scores(batch_size=1000):
+    cart_weight = settings.RECIPE_SCORE_CART_WEIGHT
+    today = timezone.now().date()
+    trending = defaultdict(float)
+    add_trending_activity(trending, Favorite, 1, today)
+    add_trending_activity(trending, ShoppingCart, cart_weight, today)
+    counters = Recipe.objects.values_list(
+        'id', 'favorites_count', 'in_carts_count'
+    ).order_by()
+    scores = (
+        RecipeScore(
+            recipe_id=recipe_id,
+            popular=favorites + cart_weight * in_carts,
+            trending=trending.get(recipe_id, 0),
+        )
+        for recipe_id, favorites, in_carts in counters.iterator()
+    )
+    with transaction.atomic():
+        RecipeScore.objects.all().delete()
+        while True:
+            batch = list(islice(scores, batch_size))
+            if not batch:
+                break
+            RecipeScore.objects.bulk_create(batch)
+    return len(trending)
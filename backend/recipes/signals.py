@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# post_save для bulk_create и bulk_update, аргументы instances и created.
+bulk_saved = Signal()
@@ -1,29 +1,102 @@
-from googletrans import Translator
+from threading import RLock
 
-translator = Translator()
+from django.conf import settings
+from django.utils import timezone
+from django.utils.text import slugify
+
+CYRILLIC_TO_LATIN = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+})
+
+_translators = {}
+_translator_lock = RLock()
+
+
+def transliterate(string):
+    return string.lower().translate(CYRILLIC_TO_LATIN)
+
+
+def get_translator():
+    """Один клиент на процесс, создаётся при первом переводе."""
+    with _translator_lock:
+        if 'default' not in _translators:
+            from googletrans import Translator
+
+            _translators['default'] = Translator(
+                timeout=settings.TRANSLATION_TIMEOUT
+            )
+        return _translators['default']
+
+
+def translate(string, dest='en'):
+    """Запросы к общему клиенту идут по очереди."""
+    with _translator_lock:
+        return get_translator().translate(string, dest=dest)
 
 
 def get_translate_ru_to_en(string):
-    response = translator.translate(string, dest='en')
-    return response.text
+    return translate(string).text
+
+
+def translate_many(strings, dest='en'):
+    """Переводит строки одним запросом, с LRU в таблице Translation."""
+    from recipes.models import Translation
+
+    strings = list(dict.fromkeys(strings))
+    known = Translation.objects.filter(source__in=strings, dest=dest)
+    translations = {item.source: item.text for item in known}
+    Translation.objects.filter(
+        source__in=translations, dest=dest
+    ).update(last_used=timezone.now())
+
+    missing = [string for string in strings if string not in translations]
+    if not missing:
+        return translations
+    translated = get_translate_ru_to_en('\n'.join(missing)).split('\n')
+    if len(translated) != len(missing):
+        translated = [get_translate_ru_to_en(string) for string in missing]
+    translated = [text.strip() for text in translated]
+    translations.update(zip(missing, translated))
+    Translation.objects.bulk_create(
+        [
+            Translation(source=source, dest=dest, text=text)
+            for source, text in zip(missing, translated)
+        ],
+        ignore_conflicts=True,
+    )
+    stale = Translation.objects.order_by('-last_used').values_list(
+        'id', flat=True
+    )[settings.TRANSLATION_CACHE_SIZE:]
+    Translation.objects.filter(id__in=list(stale)).delete()
+    return translations
 
 
-def all_possible_translations(string):
-    response = translator.translate(string, dest='en')
-    target = response.extra_data['parsed'][1][0][0][5][0]
+def get_cached_translate_ru_to_en(string):
+    return translate_many([string])[string]
 
-    queue, out = [target], []
-    while queue:
-        elem = queue.pop(-1)
-        if isinstance(elem, list):
-            queue.extend(elem)
-        else:
-            out.append(elem)
 
-    return [item for item in out if isinstance(item, str)]
+def make_slug(string):
+    if settings.TAG_SLUG_TRANSLATE:
+        try:
+            string = get_cached_translate_ru_to_en(string)
+        except Exception:
+            pass
+    return slugify(transliterate(string))
 
 
-def get_alternative(string):
-    translations = all_possible_translations(string)
-    alternative = [item for item in translations if item != string]
-    return alternative[0]
+def make_slugs(strings):
+    """make_slug для многих строк с одним запросом перевода."""
+    translations = {}
+    if settings.TAG_SLUG_TRANSLATE:
+        try:
+            translations = translate_many(strings)
+        except Exception:
+            pass
+    return {
+        string: slugify(transliterate(translations.get(string, string)))
+        for string in strings
+    }
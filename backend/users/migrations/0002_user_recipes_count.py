@@ -0,0 +1,29 @@
+# Generated by Django 3.1 on 2026-10-18 05:58
+
+from django.db import migrations, models
+
+from recipes.counters import rebuild_user_counters
+
+
+def fill_counters(apps, schema_editor):
+    rebuild_user_counters(
+        apps.get_model('users', 'User'),
+        apps.get_model('recipes', 'Recipe'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('recipes', '0002_auto_20210929_1722'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Рецептов'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -30,6 +30,11 @@ class User(AbstractUser):
         verbose_name='Фамилия',
         max_length=150
     )
+    recipes_count = models.PositiveIntegerField(
+        verbose_name='Рецептов',
+        default=0,
+        editable=False,
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']